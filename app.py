@@ -1,405 +1,905 @@
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, request, jsonify, abort, send_from_directory
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
+import orjson
 import sqlite3
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+import functools
 import os
+import queue
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows (Electron builds): no flock, init_db's write lock alone keeps it safe
+    fcntl = None
+
+class OrjsonProvider(JSONProvider):
+    """Route jsonify and request.get_json through orjson instead of the stdlib json module."""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response, skipping the decode in dumps()
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype='application/json')
 
 app = Flask(__name__, static_folder='static')
+app.json = OrjsonProvider(app)
+# Let browsers cache static files for an hour; after that they revalidate with ETag/Last-Modified.
+# index() overrides this for the page itself
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 3600
 CORS(app)
 
 DATABASE = 'chores.db'
 
+# INSERT/UPDATE ... RETURNING needs SQLite 3.35+; older builds re-select the row instead
+HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Size of sqlite3's per-connection prepared statement cache
+CACHED_STATEMENTS = 128
+
+# Seconds a connection waits on another process's write lock before raising "database is locked"
+BUSY_TIMEOUT = 30
+
+# Bump when init_db gains new tables, columns or seed data; stored in PRAGMA user_version
+SCHEMA_VERSION = 1
+
+# Set SQL_TRACE=1 to log statements that take longer than SLOW_QUERY_MS (default 10) to run
+# and fetch; off unless asked for
+SQL_TRACE = os.environ.get('SQL_TRACE') == '1'
+SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', 10))
+
+# Maximum number of idle connections kept open for reuse between requests
+POOL_SIZE = 8
+
+# One shared connection for all writes; SQLite only allows a single writer anyway
+_writer = None
+_writer_lock = threading.Lock()
+
+# LIFO so the most recently used connection, whose page cache is warmest, goes out first
+_pool = queue.LifoQueue(maxsize=POOL_SIZE)
+
+# The reset scheduler wakes at local midnight, but never sleeps longer than this
+# (seconds) so a midnight missed while the machine was suspended is caught up quickly
+RESET_CHECK_INTERVAL = 15 * 60
+
+_reset_lock = threading.Lock()
+
+# Local date the reset check last completed for; later checks that day skip SQLite entirely
+_reset_cache = {'date': None}
+
+# Applied once to every new connection. WAL (switched on once in init_db, it is stored
+# in the database file) lets readers keep going while a writer commits, and
+# synchronous=NORMAL only fsyncs at checkpoints instead of on every commit.
+# foreign_keys makes the ON DELETE clauses take effect and rejects unknown user ids (see known_users).
+SQLITE_PRAGMAS = '''
+    PRAGMA synchronous = NORMAL;
+    PRAGMA temp_store = MEMORY;
+    PRAGMA mmap_size = 268435456;
+    PRAGMA cache_size = -20000;
+    PRAGMA foreign_keys = ON;
+    PRAGMA cache_spill = OFF;
+'''
+
+# SQL used by the API endpoints. Keeping each statement as a single module-level
+# string lets sqlite3's statement cache (keyed on the SQL text) reuse the
+# prepared statement instead of re-parsing it on every request.
+SQL_GET_DATA_VERSION = "SELECT value FROM settings WHERE key = 'data_version'"
+
+# Chore fields the frontend reads; the created/updated timestamps are only used for ordering
+CHORE_COLUMNS = 'id, title, description, completed, priority, points, recurrence_type, assigned_to_all, completed_by'
+
+# Sort key for the chore lists (high first). idx_chores_priority_rank indexes this exact
+# expression, so the ORDER BYs below read chores in index order instead of sorting them
+PRIORITY_RANK = "CASE priority WHEN 'high' THEN 1 WHEN 'medium' THEN 2 WHEN 'low' THEN 3 END"
+
+SQL_GET_CHORES_ALL = f'''
+    SELECT {CHORE_COLUMNS} FROM chores 
+    ORDER BY {PRIORITY_RANK}, created_at DESC
+'''
+
+SQL_GET_CHORES_FOR_USER = f'''
+    SELECT {CHORE_COLUMNS}
+    FROM chores c
+    WHERE 
+        (c.assigned_to_all = 1 AND (c.completed = 0 OR c.completed_by = ?))
+        OR (c.assigned_to_all = 0 AND EXISTS (
+            SELECT 1 FROM chore_assignments ca WHERE ca.chore_id = c.id AND ca.user_id = ?
+        ))
+    ORDER BY {PRIORITY_RANK}, c.created_at DESC
+'''
+
+SQL_GET_CHORE_BY_ID = f'SELECT {CHORE_COLUMNS} FROM chores WHERE id = ?'
+
+SQL_GET_CHORE_ASSIGNMENTS = '''
+    SELECT ca.id, ca.chore_id, ca.user_id, ca.completed, ca.completed_at, u.name as user_name 
+    FROM chore_assignments ca
+    JOIN users u ON ca.user_id = u.id
+    WHERE ca.chore_id = ?
+'''
+
+SQL_GET_ALL_ASSIGNMENTS = '''
+    SELECT ca.id, ca.chore_id, ca.user_id, ca.completed, ca.completed_at, u.name as user_name 
+    FROM chore_assignments ca
+    JOIN users u ON ca.user_id = u.id
+    ORDER BY ca.chore_id, ca.user_id
+'''
+
+SQL_INSERT_CHORE = 'INSERT INTO chores (title, description, priority, points, recurrence_type, assigned_to_all) VALUES (?, ?, ?, ?, ?, ?)'
+
+SQL_INSERT_CHORE_RETURNING = SQL_INSERT_CHORE + ' RETURNING ' + CHORE_COLUMNS
+
+# Partial update: each :has_<field> flag says whether the request sent that field, and
+# fields it left out keep their stored value. Points follow the (new) priority, and
+# marking a chore incomplete clears completed_by, as create_chore and the UI expect.
+CHORE_UPDATE_FIELDS = ('title', 'description', 'completed', 'priority', 'completed_by', 'recurrence_type', 'assigned_to_all')
+
+SQL_UPDATE_CHORE = '''
+    UPDATE chores 
+    SET title = CASE WHEN :has_title THEN :title ELSE title END,
+        description = CASE WHEN :has_description THEN :description ELSE description END,
+        completed = CASE WHEN :has_completed THEN :completed ELSE completed END,
+        priority = CASE WHEN :has_priority THEN :priority ELSE priority END,
+        points = CASE WHEN (CASE WHEN :has_priority THEN :priority ELSE priority END) = 'high' THEN 2 ELSE 1 END,
+        completed_by = CASE WHEN (CASE WHEN :has_completed THEN :completed ELSE completed END)
+            THEN (CASE WHEN :has_completed_by THEN :completed_by ELSE completed_by END)
+        END,
+        recurrence_type = CASE WHEN :has_recurrence_type THEN :recurrence_type ELSE recurrence_type END,
+        assigned_to_all = CASE WHEN :has_assigned_to_all THEN :assigned_to_all ELSE assigned_to_all END,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE id = :id
+'''
+
+SQL_UPDATE_CHORE_RETURNING = SQL_UPDATE_CHORE + ' RETURNING ' + CHORE_COLUMNS
+
+SQL_DELETE_CHORE = 'DELETE FROM chores WHERE id = ?'
+
+# Duplicate user ids are skipped by the (chore_id, user_id) unique index rather than raising
+SQL_INSERT_ASSIGNMENT = 'INSERT INTO chore_assignments (chore_id, user_id) VALUES (?, ?) ON CONFLICT DO NOTHING'
+
+SQL_DELETE_CHORE_ASSIGNMENTS = 'DELETE FROM chore_assignments WHERE chore_id = ?'
+
+SQL_GET_USERS = 'SELECT id, name, role, pin, avatar, color FROM users ORDER BY name ASC'
+
+SQL_GET_USER_BY_ID = 'SELECT id, name, role, pin, avatar, color FROM users WHERE id = ?'
+
+SQL_UPDATE_USER_AVATAR = 'UPDATE users SET avatar = ? WHERE id = ?'
+
+SQL_UPDATE_USER_COLOR = 'UPDATE users SET color = ? WHERE id = ?'
+
+SQL_GET_ASSIGNMENT_COMPLETED = 'SELECT completed FROM chore_assignments WHERE id = ?'
+
+# Points of the chore an assignment belongs to
+SQL_GET_ASSIGNMENT_CHORE_POINTS = '''
+    SELECT points FROM chores
+    WHERE id = (SELECT chore_id FROM chore_assignments WHERE id = ?)
+'''
+
+# completed_at keeps the ISO 8601 'T' format datetime.isoformat() used to write
+SQL_COMPLETE_ASSIGNMENT = '''
+    UPDATE chore_assignments 
+    SET completed = :completed,
+        completed_at = CASE WHEN :completed THEN strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime') END
+    WHERE id = :id
+'''
+
+# Column order of both leaderboard queries, so rows can be zipped without reading cursor.description
+LEADERBOARD_KEYS = ('id', 'name', 'role', 'avatar', 'color', 'points')
+
+# Points per user from completed general chores plus completed assignments, each source
+# aggregated once, so the leaderboards join against it instead of re-summing per user
+SQL_WEEKLY_POINTS_BY_USER = '''
+        SELECT completed_by AS user_id, SUM(points) AS points FROM chores
+        WHERE completed = 1 AND completed_by IS NOT NULL
+        GROUP BY completed_by
+        UNION ALL
+        SELECT ca.user_id, SUM(c.points) FROM chore_assignments ca
+        JOIN chores c ON ca.chore_id = c.id
+        WHERE ca.completed = 1
+        GROUP BY ca.user_id
+'''
+
+SQL_GET_LEADERBOARD = f'''
+    SELECT 
+        u.id,
+        u.name,
+        u.role,
+        u.avatar,
+        u.color,
+        COALESCE(SUM(p.points), 0) as points
+    FROM users u
+    LEFT JOIN ({SQL_WEEKLY_POINTS_BY_USER}) p ON p.user_id = u.id
+    GROUP BY u.id
+    ORDER BY points DESC, u.name ASC
+'''
+
+SQL_GET_ALL_TIME_LEADERBOARD = f'''
+    SELECT 
+        u.id,
+        u.name,
+        u.role,
+        u.avatar,
+        u.color,
+        COALESCE(SUM(p.points), 0) as points
+    FROM users u
+    LEFT JOIN ({SQL_WEEKLY_POINTS_BY_USER}
+        UNION ALL
+        SELECT user_id, SUM(points) FROM all_time_points
+        GROUP BY user_id
+    ) p ON p.user_id = u.id
+    GROUP BY u.id
+    ORDER BY points DESC, u.name ASC
+'''
+
+SQL_SAVE_WEEKLY_POINTS = f'''
+    INSERT INTO all_time_points (user_id, points, reason)
+    SELECT user_id, SUM(points), ?
+    FROM ({SQL_WEEKLY_POINTS_BY_USER})
+    GROUP BY user_id
+    HAVING SUM(points) > 0
+'''
+
+# Completed general chores, then completed assignments, for one user (bound to ?1)
+SQL_GET_USER_HISTORY = '''
+    SELECT c.title, c.completed_by, 'chore' as type
+    FROM chores c
+    WHERE c.completed_by = ?1 AND c.completed = 1
+    UNION ALL
+    SELECT c.title, ca.user_id, 'assignment' as type
+    FROM chore_assignments ca
+    JOIN chores c ON ca.chore_id = c.id
+    WHERE ca.user_id = ?1 AND ca.completed = 1
+'''
+
+# A UNION ALL names its columns after the first SELECT, so each row's keys are picked by its
+# type: chore entries report completed_by and assignment entries user_id, as they always have
+HISTORY_KEYS = {
+    'chore': ('title', 'completed_by', 'type'),
+    'assignment': ('title', 'user_id', 'type'),
+}
+
+SQL_INSERT_POINTS_ADJUSTMENT = '''
+    INSERT INTO chores (title, description, priority, points, recurrence_type, assigned_to_all, completed, completed_by)
+    VALUES (?, ?, 'medium', ?, 'one-time', 0, 1, ?)
+'''
+
+SQL_SPLIT_GENERAL_CHORE = 'UPDATE chores SET assigned_to_all = 0, points = ? WHERE id = ?'
+
+# Halve the points of the chore an assignment belongs to
+SQL_HALVE_ASSIGNMENT_CHORE_POINTS = '''
+    UPDATE chores SET points = points / 2.0
+    WHERE id = (SELECT chore_id FROM chore_assignments WHERE id = ?)
+'''
+
+SQL_HALVE_ASSIGNMENT_CHORE_POINTS_RETURNING = SQL_HALVE_ASSIGNMENT_CHORE_POINTS + ' RETURNING points'
+
+SQL_INSERT_SPLIT_ASSIGNMENT = '''
+    INSERT INTO chore_assignments (chore_id, user_id, completed)
+    VALUES (?, ?, 0)
+    ON CONFLICT (chore_id, user_id) DO NOTHING
+'''
+
+# Give another user (first parameter) the chore of an assignment (second parameter), but only
+# while that assignment exists and is incomplete and the user doesn't already have the chore
+SQL_INSERT_SPLIT_FROM_ASSIGNMENT = '''
+    INSERT INTO chore_assignments (chore_id, user_id, completed)
+    SELECT chore_id, ?, 0 FROM chore_assignments
+    WHERE id = ? AND completed = 0
+    ON CONFLICT (chore_id, user_id) DO NOTHING
+'''
+
+# Both reset markers alongside today's local date and the Monday starting this week
+SQL_GET_RESET_MARKERS = '''
+    SELECT
+        MAX(CASE WHEN key = 'last_reset_date' THEN value END),
+        MAX(CASE WHEN key = 'last_reset_week' THEN value END),
+        date('now', 'localtime'),
+        date('now', 'localtime', 'weekday 0', '-6 days')
+    FROM settings
+    WHERE key IN ('last_reset_date', 'last_reset_week')
+'''
+
+# Reset statements shared by the daily and weekly resets; the recurrence type is a parameter.
+# History rows are stamped datetime('now', <modifier>) so daily completions land on the previous day.
+SQL_ARCHIVE_COMPLETED_CHORES = '''
+    INSERT INTO completion_history (chore_id, user_id, completed_at, week_start_date)
+    SELECT id, completed_by, datetime('now', ?1), ?2 FROM chores 
+    WHERE completed = 1 AND completed_by IS NOT NULL AND recurrence_type = ?3
+'''
+
+SQL_RESET_CHORES = '''
+    UPDATE chores 
+    SET completed = 0, completed_by = NULL, updated_at = CURRENT_TIMESTAMP
+    WHERE recurrence_type = ?
+'''
+
+SQL_ARCHIVE_COMPLETED_ASSIGNMENTS = '''
+    INSERT INTO completion_history (chore_id, user_id, completed_at, week_start_date)
+    SELECT ca.chore_id, ca.user_id, datetime('now', ?1), ?2 FROM chore_assignments ca
+    JOIN chores c ON ca.chore_id = c.id
+    WHERE ca.completed = 1 AND c.recurrence_type = ?3
+'''
+
+SQL_RESET_ASSIGNMENTS = '''
+    UPDATE chore_assignments 
+    SET completed = 0, completed_at = NULL
+    WHERE chore_id IN (SELECT id FROM chores WHERE recurrence_type = ?)
+'''
+
+SQL_SET_SETTING = 'UPDATE settings SET value = ? WHERE key = ?'
+
+# Completion history outlives the chores it records: deleting a chore only clears chore_id.
+# Shared by the schema script and the init_db migration that rebuilds older history tables.
+SQL_CREATE_COMPLETION_HISTORY = '''
+    CREATE TABLE IF NOT EXISTS completion_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        chore_id INTEGER,
+        user_id INTEGER NOT NULL,
+        completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        week_start_date TEXT NOT NULL,
+        FOREIGN KEY (chore_id) REFERENCES chores (id) ON DELETE SET NULL,
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )
+'''
+
+# Schema bootstrap, run as one script by init_db. Columns added after the first release
+# are migrated separately there with ALTER TABLE.
+SQL_SCHEMA = '''
+    BEGIN IMMEDIATE;
+    
+    -- Users with roles
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL UNIQUE,
+        role TEXT NOT NULL CHECK(role IN ('admin', 'standard')),
+        pin TEXT DEFAULT NULL,
+        avatar TEXT DEFAULT '👤',
+        color TEXT DEFAULT '#6366f1',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    
+    -- Chores with completed_by and recurring fields
+    CREATE TABLE IF NOT EXISTS chores (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT NOT NULL,
+        description TEXT,
+        completed BOOLEAN NOT NULL DEFAULT 0,
+        priority TEXT DEFAULT 'medium',
+        points INTEGER DEFAULT 1,
+        recurrence_type TEXT DEFAULT 'weekly' CHECK(recurrence_type IN ('daily', 'weekly', 'one-time')),
+        assigned_to_all BOOLEAN NOT NULL DEFAULT 1,
+        completed_by INTEGER,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (completed_by) REFERENCES users (id)
+    );
+    
+    -- Chore assignments (for user-specific assignments)
+    CREATE TABLE IF NOT EXISTS chore_assignments (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        chore_id INTEGER NOT NULL,
+        user_id INTEGER NOT NULL,
+        completed BOOLEAN NOT NULL DEFAULT 0,
+        completed_at TIMESTAMP,
+        FOREIGN KEY (chore_id) REFERENCES chores (id) ON DELETE CASCADE,
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    );
+    
+    -- Completion history
+''' + SQL_CREATE_COMPLETION_HISTORY + ''';
+    
+    -- All-time points
+    CREATE TABLE IF NOT EXISTS all_time_points (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        points INTEGER NOT NULL DEFAULT 0,
+        reason TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    );
+    
+    -- Settings for tracking last reset
+    CREATE TABLE IF NOT EXISTS settings (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    );
+    
+    -- Indexes for the leaderboard sums, chore list ordering, resets and the user history
+    -- endpoint (which reads chores and assignments). The partial indexes only hold completed
+    -- rows and carry the columns the point sums read, so those lookups never touch the tables
+    CREATE INDEX IF NOT EXISTS idx_chores_completed_points ON chores (completed_by, points) WHERE completed = 1;
+    CREATE INDEX IF NOT EXISTS idx_assignments_user_completed ON chore_assignments (user_id, chore_id) WHERE completed = 1;
+    CREATE INDEX IF NOT EXISTS idx_chores_priority_rank ON chores (''' + PRIORITY_RANK + ''', created_at DESC);
+    CREATE INDEX IF NOT EXISTS idx_chores_recurrence ON chores (recurrence_type, completed);
+    CREATE INDEX IF NOT EXISTS idx_all_time_points_user ON all_time_points (user_id, points);
+    
+    -- One assignment per user per chore; clear out duplicates older databases may hold first
+    DELETE FROM chore_assignments WHERE id NOT IN (
+        SELECT MIN(id) FROM chore_assignments GROUP BY chore_id, user_id
+    );
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_assignments_chore_user ON chore_assignments (chore_id, user_id);
+    
+    -- Last reset week (Monday of current week: next Sunday, minus six days) and day
+    INSERT OR IGNORE INTO settings (key, value)
+    VALUES ('last_reset_week', date('now', 'localtime', 'weekday 0', '-6 days'));
+    INSERT OR IGNORE INTO settings (key, value) VALUES ('last_reset_date', date('now', 'localtime'));
+    
+    -- Bump a shared data version on every change to the tables the API reads, so
+    -- GET endpoints can answer If-None-Match without re-running their queries
+    INSERT OR IGNORE INTO settings (key, value) VALUES ('data_version', '0');
+''' + ''.join(f'''
+    CREATE TRIGGER IF NOT EXISTS bump_data_version_{table}_{event.lower()}
+    AFTER {event} ON {table}
+    BEGIN
+        UPDATE settings SET value = value + 1 WHERE key = 'data_version';
+    END;
+''' for table in ('chores', 'chore_assignments', 'users', 'all_time_points')
+    for event in ('INSERT', 'UPDATE', 'DELETE')) + '''
+    COMMIT;
+'''
+
 # Initialize database on startup (important for gunicorn/production)
 def initialize_database():
     """Initialize the database on app startup."""
-    if not os.path.exists(DATABASE):
-        print(f"Database {DATABASE} not found. Creating...")
-    init_db()
-    print(f"Database initialized: {DATABASE}")
+    # gunicorn workers import the app at the same time; the lock lets one bootstrap the schema
+    # while the others wait and then take init_db's user_version fast path
+    with open(DATABASE + '.lock', 'w') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        if not os.path.exists(DATABASE):
+            print(f"Database {DATABASE} not found. Creating...")
+        bootstrapped = init_db()
+    if bootstrapped:
+        print(f"Database initialized: {DATABASE}")
+
+class TracedCursor(sqlite3.Cursor):
+    """Cursor that adds up the time spent running and fetching a statement and logs it if slow."""
+    
+    _sql = None
+    _elapsed = 0.0
+    
+    def _timed(self, run, *args):
+        start = time.perf_counter()
+        try:
+            return run(*args)
+        finally:
+            self._elapsed += time.perf_counter() - start
+    
+    def _report(self):
+        # Called once per statement: when its rows are used up, the cursor is closed, or (for rows
+        # left unread, e.g. a fetchone() lookup) the connection runs its next statement
+        elapsed_ms = self._elapsed * 1000
+        if self._sql is not None and elapsed_ms > SLOW_QUERY_MS:
+            app.logger.warning("Slow query (%.1f ms): %s", elapsed_ms, ' '.join(self._sql.split()))
+        self._sql = None
+    
+    def _start(self, sql):
+        self._report()
+        self._sql, self._elapsed = sql, 0.0
+    
+    def execute(self, sql, params=()):
+        self._start(sql)
+        self._timed(super().execute, sql, params)
+        if self.description is None:
+            # No rows to fetch, so the statement already ran to completion
+            self._report()
+        return self
+    
+    def executemany(self, sql, params):
+        self._start(sql)
+        self._timed(super().executemany, sql, params)
+        self._report()
+        return self
+    
+    def fetchone(self):
+        row = self._timed(super().fetchone)
+        if row is None:
+            self._report()
+        return row
+    
+    def fetchall(self):
+        rows = self._timed(super().fetchall)
+        self._report()
+        return rows
+    
+    def __next__(self):
+        try:
+            return self._timed(super().__next__)
+        except StopIteration:
+            self._report()
+            raise
+    
+    def close(self):
+        self._report()
+        super().close()
+
+class TracedConnection(sqlite3.Connection):
+    """Connection whose statements, including the conn.execute shortcuts, run on TracedCursor."""
+    
+    _last_cursor = None
+    
+    def cursor(self, factory=TracedCursor):
+        return super().cursor(factory)
+    
+    def _next_cursor(self):
+        # The previous statement is finished with once the next one starts
+        if self._last_cursor is not None:
+            self._last_cursor._report()
+        self._last_cursor = self.cursor()
+        return self._last_cursor
+    
+    def execute(self, sql, params=()):
+        return self._next_cursor().execute(sql, params)
+    
+    def executemany(self, sql, params):
+        return self._next_cursor().executemany(sql, params)
+    
+    def close(self):
+        if self._last_cursor is not None:
+            self._last_cursor._report()
+        super().close()
 
 def get_db_connection():
     """Create a database connection."""
-    conn = sqlite3.connect(DATABASE)
+    factory = TracedConnection if SQL_TRACE else sqlite3.Connection
+    # isolation_level=None: no implicit BEGINs, writes are grouped with transaction()
+    conn = sqlite3.connect(DATABASE, timeout=BUSY_TIMEOUT, cached_statements=CACHED_STATEMENTS, check_same_thread=False, isolation_level=None, factory=factory)
     conn.row_factory = sqlite3.Row
+    conn.executescript(SQLITE_PRAGMAS)
     return conn
 
+@contextmanager
+def get_conn():
+    """Borrow a pooled connection for reads and return it to the pool when done."""
+    try:
+        conn = _pool.get_nowait()
+    except queue.Empty:
+        conn = get_db_connection()
+        # Pooled connections only read; a stray write fails instead of slipping past the writer lock
+        conn.execute('PRAGMA query_only = ON')
+    try:
+        yield conn
+    finally:
+        # Never hand a connection with a half-finished transaction to the next request
+        if conn.in_transaction:
+            conn.rollback()
+        try:
+            _pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+@contextmanager
+def get_writer():
+    """Hold the shared writer connection; writes from this process take turns on it."""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = get_db_connection()
+        try:
+            yield _writer
+        finally:
+            if _writer.in_transaction:
+                _writer.rollback()
+
+@contextmanager
+def transaction(conn):
+    """Run the enclosed writes as one BEGIN IMMEDIATE ... COMMIT transaction."""
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        yield conn
+    except BaseException:
+        conn.execute('ROLLBACK')
+        raise
+    conn.execute('COMMIT')
+
+@contextmanager
+def known_users():
+    """Answer 400 instead of 500 when the enclosed writes name a user id that doesn't exist."""
+    try:
+        yield
+    except sqlite3.IntegrityError as e:
+        # foreign_keys is on, so an unknown user id fails its REFERENCES users (id) check
+        if 'FOREIGN KEY' not in str(e):
+            raise
+        # abort() raises, so an enclosing transaction() still rolls back
+        abort(json_response({'error': 'Unknown user'}, 400))
+
+def column_names(cursor):
+    """Return the result column names of an executed cursor."""
+    return tuple(column[0] for column in cursor.description)
+
+def fetch_dicts(conn, sql, params=()):
+    """Run a query and build each result row straight into a dict, reading the column names once."""
+    cursor = conn.execute(sql, params)
+    keys = column_names(cursor)
+    return [dict(zip(keys, row)) for row in cursor]
+
+def rows_to_json(rows, keys):
+    """Encode result rows as a JSON array of objects sharing one key tuple."""
+    return orjson.dumps([dict(zip(keys, row)) for row in rows])
+
+def json_response(body, status=200):
+    """Wrap JSON (already-encoded bytes, or data to encode with orjson) in a response."""
+    if not isinstance(body, bytes):
+        body = orjson.dumps(body)
+    return app.response_class(body, status=status, mimetype='application/json')
+
+def etag_response(etag, build_body):
+    """Answer 304 if the client already holds this ETag, otherwise send the JSON body build_body() returns."""
+    if etag in request.if_none_match:
+        response = app.response_class(status=304)
+    else:
+        response = json_response(build_body())
+    response.set_etag(etag)
+    return response
+
+def split_message(points_per_person):
+    """Build the success message for a split from the points each user now gets for the chore."""
+    total = points_per_person * 2
+    if total == int(total):
+        total = int(total)
+    return f'✅ Task split! The {total} points are now divided: you each get {int(points_per_person)} point(s) when completed. (Total: {total} points awarded)'
+
+def current_data_version():
+    """Read the counter the triggers bump on every write; it keys the cached bodies and ETags."""
+    with get_conn() as conn:
+        return conn.execute(SQL_GET_DATA_VERSION).fetchone()[0]
+
+def parse_body():
+    """Decode the JSON request body with orjson; an empty body decodes to {}."""
+    try:
+        return orjson.loads(request.get_data(cache=False) or b'{}')
+    except orjson.JSONDecodeError:
+        abort(400, 'Request body is not valid JSON')
+
 def init_db():
-    """Initialize the database with users and chores tables."""
+    """Initialize the database with users and chores tables; returns False if it was already current."""
     try:
         conn = get_db_connection()
         
-        # Create users table with roles
-        conn.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL UNIQUE,
-                role TEXT NOT NULL CHECK(role IN ('admin', 'standard')),
-                pin TEXT DEFAULT NULL,
-                avatar TEXT DEFAULT '👤',
-                color TEXT DEFAULT '#6366f1',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
+        # WAL is persistent, so setting it here covers every later connection
+        journal_mode = conn.execute('PRAGMA journal_mode = WAL').fetchone()[0]
+        if journal_mode != 'wal':
+            print(f"Warning: SQLite is using journal_mode={journal_mode} instead of WAL")
         
-        # Add avatar and color columns if they don't exist (for existing databases)
-        try:
-            conn.execute('ALTER TABLE users ADD COLUMN avatar TEXT DEFAULT "👤"')
-        except sqlite3.OperationalError:
-            pass  # Column already exists
+        # Already bootstrapped at this version: skip the DDL and seeding on restart
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            conn.close()
+            return False
         
-        try:
-            conn.execute('ALTER TABLE users ADD COLUMN color TEXT DEFAULT "#6366f1"')
-        except sqlite3.OperationalError:
-            pass  # Column already exists
+        # Column migrations only run for databases from before user_version was tracked. They run
+        # before the schema script because its indexes use these columns; on a new database the
+        # tables don't exist yet, the ALTERs fail, and the script creates the tables with every column
+        conn.execute('BEGIN IMMEDIATE')
         
-        try:
-            conn.execute('ALTER TABLE users ADD COLUMN pin TEXT DEFAULT NULL')
-            # Set PIN for admin accounts
-            conn.execute("UPDATE users SET pin = '1234' WHERE role = 'admin'")
-            conn.commit()
-        except sqlite3.OperationalError:
-            pass  # Column already exists
-        
-        # Seed default users if table is empty
-        count = conn.execute('SELECT COUNT(*) FROM users').fetchone()[0]
-        if count == 0:
-            # Add admins with PIN
-            conn.execute("INSERT INTO users (name, role, pin) VALUES ('Jordan', 'admin', '1234')")
-            conn.execute("INSERT INTO users (name, role, pin) VALUES ('Sarah', 'admin', '1234')")
-            # Add standard users
-            conn.execute("INSERT INTO users (name, role) VALUES ('Mason', 'standard')")
-            conn.execute("INSERT INTO users (name, role) VALUES ('Liam', 'standard')")
-            conn.execute("INSERT INTO users (name, role) VALUES ('Addison', 'standard')")
+        if version < 1:
+            # Add avatar and color columns if they don't exist (for existing databases)
+            try:
+                conn.execute('ALTER TABLE users ADD COLUMN avatar TEXT DEFAULT "👤"')
+            except sqlite3.OperationalError:
+                pass  # Column already exists
+            
+            try:
+                conn.execute('ALTER TABLE users ADD COLUMN color TEXT DEFAULT "#6366f1"')
+            except sqlite3.OperationalError:
+                pass  # Column already exists
+            
+            try:
+                conn.execute('ALTER TABLE users ADD COLUMN pin TEXT DEFAULT NULL')
+                # Set PIN for admin accounts
+                conn.execute("UPDATE users SET pin = '1234' WHERE role = 'admin'")
+            except sqlite3.OperationalError:
+                pass  # Column already exists
+            
+            # Add points column if it doesn't exist (for existing databases)
+            try:
+                conn.execute('ALTER TABLE chores ADD COLUMN points INTEGER DEFAULT 1')
+                # Update existing chores: high priority = 2 points, others = 1 point
+                conn.execute("UPDATE chores SET points = 2 WHERE priority = 'high' AND points = 1")
+                conn.execute("UPDATE chores SET points = 1 WHERE priority != 'high' AND points IS NULL")
+            except sqlite3.OperationalError:
+                pass  # Column already exists
+            
+            # History tables created before foreign_keys was turned on cascade chore deletes;
+            # SQLite can't change a foreign key in place, so rebuild the table with the new one
+            history_fks = conn.execute('PRAGMA foreign_key_list(completion_history)').fetchall()
+            if any(fk['table'] == 'chores' and fk['on_delete'] == 'CASCADE' for fk in history_fks):
+                conn.execute('ALTER TABLE completion_history RENAME TO completion_history_old')
+                conn.execute(SQL_CREATE_COMPLETION_HISTORY)
+                conn.execute('''
+                    INSERT INTO completion_history (id, chore_id, user_id, completed_at, week_start_date)
+                    SELECT id, chore_id, user_id, completed_at, week_start_date FROM completion_history_old
+                ''')
+                conn.execute('DROP TABLE completion_history_old')
+        
+        conn.execute('COMMIT')
+        
+        # Tables, indexes, triggers and settings in one script; every statement is idempotent,
+        # so workers bootstrapping at the same time just take turns on the write lock
+        conn.executescript(SQL_SCHEMA)
+        
+        conn.execute('BEGIN IMMEDIATE')
+        
+        # Seed default users if table is empty, in one statement (no separate COUNT).
+        # Admins get a PIN, standard users don't
+        seeded = conn.execute('''
+            INSERT INTO users (name, role, pin)
+            SELECT * FROM (VALUES
+                ('Jordan', 'admin', '1234'),
+                ('Sarah', 'admin', '1234'),
+                ('Mason', 'standard', NULL),
+                ('Liam', 'standard', NULL),
+                ('Addison', 'standard', NULL)
+            )
+            WHERE NOT EXISTS (SELECT 1 FROM users)
+        ''').rowcount
+        if seeded:
             print("Seeded default users: Jordan, Sarah (admins), Mason, Liam, Addison (standard)")
         
         # Ensure all admin accounts have PIN set (for existing databases)
         conn.execute("UPDATE users SET pin = '1234' WHERE role = 'admin' AND (pin IS NULL OR pin = '')")
-        conn.commit()
-        
-        # Create chores table with completed_by and recurring fields
-        conn.execute('''
-            CREATE TABLE IF NOT EXISTS chores (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                description TEXT,
-                completed BOOLEAN NOT NULL DEFAULT 0,
-                priority TEXT DEFAULT 'medium',
-                points INTEGER DEFAULT 1,
-                recurrence_type TEXT DEFAULT 'weekly' CHECK(recurrence_type IN ('daily', 'weekly', 'one-time')),
-                assigned_to_all BOOLEAN NOT NULL DEFAULT 1,
-                completed_by INTEGER,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (completed_by) REFERENCES users (id)
-            )
-        ''')
         
-        # Add points column if it doesn't exist (for existing databases)
-        try:
-            conn.execute('ALTER TABLE chores ADD COLUMN points INTEGER DEFAULT 1')
-            # Update existing chores: high priority = 2 points, others = 1 point
-            conn.execute("UPDATE chores SET points = 2 WHERE priority = 'high' AND points = 1")
-            conn.execute("UPDATE chores SET points = 1 WHERE priority != 'high' AND points IS NULL")
-            conn.commit()
-        except sqlite3.OperationalError:
-            pass  # Column already exists
-        
-        # Create chore assignments table (for user-specific assignments)
-        conn.execute('''
-            CREATE TABLE IF NOT EXISTS chore_assignments (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                chore_id INTEGER NOT NULL,
-                user_id INTEGER NOT NULL,
-                completed BOOLEAN NOT NULL DEFAULT 0,
-                completed_at TIMESTAMP,
-                FOREIGN KEY (chore_id) REFERENCES chores (id) ON DELETE CASCADE,
-                FOREIGN KEY (user_id) REFERENCES users (id)
-            )
-        ''')
-        
-        # Create completion history table
-        conn.execute('''
-            CREATE TABLE IF NOT EXISTS completion_history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                chore_id INTEGER NOT NULL,
-                user_id INTEGER NOT NULL,
-                completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                week_start_date TEXT NOT NULL,
-                FOREIGN KEY (chore_id) REFERENCES chores (id) ON DELETE CASCADE,
-                FOREIGN KEY (user_id) REFERENCES users (id)
-            )
-        ''')
-        
-        # Create all-time points table
-        conn.execute('''
-            CREATE TABLE IF NOT EXISTS all_time_points (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                points INTEGER NOT NULL DEFAULT 0,
-                reason TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users (id)
-            )
-        ''')
+        # Refresh planner statistics so the indexes actually get picked
+        conn.execute('ANALYZE')
         
-        # Create settings table for tracking last reset
-        conn.execute('''
-            CREATE TABLE IF NOT EXISTS settings (
-                key TEXT PRIMARY KEY,
-                value TEXT NOT NULL
-            )
-        ''')
-        
-        # Initialize last reset week (Monday of current week)
-        today = datetime.now().date()
-        # Get Monday of this week (weekday 0 = Monday)
-        days_since_monday = today.weekday()
-        monday = today - timedelta(days=days_since_monday)
-        conn.execute('''
-            INSERT OR IGNORE INTO settings (key, value) VALUES ('last_reset_week', ?)
-        ''', (monday.isoformat(),))
-        
-        # Initialize last daily reset date
-        conn.execute('''
-            INSERT OR IGNORE INTO settings (key, value) VALUES ('last_reset_date', ?)
-        ''', (today.isoformat(),))
-        
-        conn.commit()
+        conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        conn.execute('COMMIT')
         conn.close()
+        return True
     except Exception as e:
         print(f"Error initializing database: {e}")
         raise
 
-# Initialize database when the app starts (works with gunicorn)
-initialize_database()
-
 def check_and_reset_chores():
     """Check if it's a new day/week and reset chores accordingly."""
+    checked_date = datetime.now().date().isoformat()
+    if _reset_cache['date'] == checked_date:
+        return
+    
     try:
-        conn = get_db_connection()
-        today = datetime.now().date()
-        today_str = today.isoformat()
-        
-        # Check for daily reset
-        last_reset_date = conn.execute("SELECT value FROM settings WHERE key = 'last_reset_date'").fetchone()
-        last_reset_date_str = last_reset_date['value'] if last_reset_date else None
-        
-        if last_reset_date_str != today_str:
-            print(f"New day detected! Resetting daily chores. Last reset: {last_reset_date_str}, Today: {today_str}")
-            
-            # Save daily chore completions to history
-            daily_completed = conn.execute('''
-                SELECT id, completed_by FROM chores 
-                WHERE completed = 1 AND completed_by IS NOT NULL AND recurrence_type = 'daily'
-            ''').fetchall()
-            
-            days_since_monday = today.weekday()
-            this_monday = today - timedelta(days=days_since_monday)
-            
-            for chore in daily_completed:
-                conn.execute('''
-                    INSERT INTO completion_history (chore_id, user_id, completed_at, week_start_date)
-                    VALUES (?, ?, datetime('now', '-1 day'), ?)
-                ''', (chore['id'], chore['completed_by'], this_monday.isoformat()))
-            
-            # Reset daily chores
-            conn.execute('''
-                UPDATE chores 
-                SET completed = 0, completed_by = NULL, updated_at = CURRENT_TIMESTAMP
-                WHERE recurrence_type = 'daily'
-            ''')
-            
-            # Reset daily assigned chore completions
-            daily_assignments = conn.execute('''
-                SELECT ca.chore_id, ca.user_id FROM chore_assignments ca
-                JOIN chores c ON ca.chore_id = c.id
-                WHERE ca.completed = 1 AND c.recurrence_type = 'daily'
-            ''').fetchall()
-            
-            for assignment in daily_assignments:
-                conn.execute('''
-                    INSERT INTO completion_history (chore_id, user_id, completed_at, week_start_date)
-                    VALUES (?, ?, datetime('now', '-1 day'), ?)
-                ''', (assignment['chore_id'], assignment['user_id'], this_monday.isoformat()))
-            
-            conn.execute('''
-                UPDATE chore_assignments 
-                SET completed = 0, completed_at = NULL
-                WHERE chore_id IN (SELECT id FROM chores WHERE recurrence_type = 'daily')
-            ''')
-            
-            conn.execute("UPDATE settings SET value = ? WHERE key = 'last_reset_date'", (today_str,))
-            print(f"Reset {len(daily_completed)} daily chores and {len(daily_assignments)} daily assignments")
-        
-        # Check for weekly reset (Monday)
-        last_reset_week = conn.execute("SELECT value FROM settings WHERE key = 'last_reset_week'").fetchone()
-        last_reset_week_str = last_reset_week['value'] if last_reset_week else None
+        reset_ran = False
         
-        days_since_monday = today.weekday()
-        this_monday = today - timedelta(days=days_since_monday)
-        this_monday_str = this_monday.isoformat()
-        
-        if last_reset_week_str != this_monday_str:
-            print(f"New week detected! Resetting weekly chores for week starting: {this_monday_str}")
-            
-            # Calculate and save current week's points to all-time before reset
-            current_points = conn.execute('''
-                SELECT 
-                    u.id as user_id,
-                    u.name,
-                    COALESCE((
-                        SELECT SUM(c.points) FROM chores c 
-                        WHERE c.completed_by = u.id AND c.completed = 1
-                    ), 0) + COALESCE((
-                        SELECT SUM(c.points) FROM chore_assignments ca
-                        JOIN chores c ON ca.chore_id = c.id
-                        WHERE ca.user_id = u.id AND ca.completed = 1
-                    ), 0) as weekly_points
-                FROM users u
-            ''').fetchall()
-            
-            for user in current_points:
-                if user['weekly_points'] > 0:
-                    conn.execute('''
-                        INSERT INTO all_time_points (user_id, points, reason)
-                        VALUES (?, ?, ?)
-                    ''', (user['user_id'], user['weekly_points'], f"Weekly total for week ending {this_monday_str}"))
-            
-            # Save weekly chore completions to history
-            weekly_completed = conn.execute('''
-                SELECT id, completed_by FROM chores 
-                WHERE completed = 1 AND completed_by IS NOT NULL AND recurrence_type = 'weekly'
-            ''').fetchall()
-            
-            for chore in weekly_completed:
-                conn.execute('''
-                    INSERT INTO completion_history (chore_id, user_id, completed_at, week_start_date)
-                    VALUES (?, ?, datetime('now'), ?)
-                ''', (chore['id'], chore['completed_by'], last_reset_week_str or this_monday_str))
-            
-            # Reset weekly chores
-            conn.execute('''
-                UPDATE chores 
-                SET completed = 0, completed_by = NULL, updated_at = CURRENT_TIMESTAMP
-                WHERE recurrence_type = 'weekly'
-            ''')
-            
-            # Reset weekly assigned chore completions
-            weekly_assignments = conn.execute('''
-                SELECT ca.chore_id, ca.user_id FROM chore_assignments ca
-                JOIN chores c ON ca.chore_id = c.id
-                WHERE ca.completed = 1 AND c.recurrence_type = 'weekly'
-            ''').fetchall()
-            
-            for assignment in weekly_assignments:
-                conn.execute('''
-                    INSERT INTO completion_history (chore_id, user_id, completed_at, week_start_date)
-                    VALUES (?, ?, datetime('now'), ?)
-                ''', (assignment['chore_id'], assignment['user_id'], last_reset_week_str or this_monday_str))
-            
-            conn.execute('''
-                UPDATE chore_assignments 
-                SET completed = 0, completed_at = NULL
-                WHERE chore_id IN (SELECT id FROM chores WHERE recurrence_type = 'weekly')
-            ''')
+        # Both markers are read and advanced inside one BEGIN IMMEDIATE transaction, so when several
+        # workers wake at midnight only the first sees them stale; the rest find nothing to do
+        with _reset_lock, get_writer() as conn:
+            with transaction(conn):
+                last_reset_date_str, last_reset_week_str, today_str, this_monday_str = conn.execute(SQL_GET_RESET_MARKERS).fetchone()
+                
+                # Check for daily reset
+                if last_reset_date_str != today_str:
+                    print(f"New day detected! Resetting daily chores. Last reset: {last_reset_date_str}, Today: {today_str}")
+                    
+                    # Save daily chore completions to history
+                    daily_completed = conn.execute(SQL_ARCHIVE_COMPLETED_CHORES, ('-1 day', this_monday_str, 'daily')).rowcount
+                    
+                    # Reset daily chores
+                    conn.execute(SQL_RESET_CHORES, ('daily',))
+                    
+                    # Reset daily assigned chore completions
+                    daily_assignments = conn.execute(SQL_ARCHIVE_COMPLETED_ASSIGNMENTS, ('-1 day', this_monday_str, 'daily')).rowcount
+                    
+                    conn.execute(SQL_RESET_ASSIGNMENTS, ('daily',))
+                    
+                    conn.execute(SQL_SET_SETTING, (today_str, 'last_reset_date'))
+                    print(f"Reset {daily_completed} daily chores and {daily_assignments} daily assignments")
+                    reset_ran = True
+                
+                # Check for weekly reset (Monday)
+                if last_reset_week_str != this_monday_str:
+                    print(f"New week detected! Resetting weekly chores for week starting: {this_monday_str}")
+                    
+                    # Calculate and save current week's points to all-time before reset
+                    conn.execute(SQL_SAVE_WEEKLY_POINTS, (f"Weekly total for week ending {this_monday_str}",))
+                    
+                    # Save weekly chore completions to history
+                    weekly_completed = conn.execute(SQL_ARCHIVE_COMPLETED_CHORES, ('+0 days', last_reset_week_str or this_monday_str, 'weekly')).rowcount
+                    
+                    # Reset weekly chores
+                    conn.execute(SQL_RESET_CHORES, ('weekly',))
+                    
+                    # Reset weekly assigned chore completions
+                    weekly_assignments = conn.execute(SQL_ARCHIVE_COMPLETED_ASSIGNMENTS, ('+0 days', last_reset_week_str or this_monday_str, 'weekly')).rowcount
+                    
+                    conn.execute(SQL_RESET_ASSIGNMENTS, ('weekly',))
+                    
+                    conn.execute(SQL_SET_SETTING, (this_monday_str, 'last_reset_week'))
+                    print(f"Reset {weekly_completed} weekly chores and {weekly_assignments} weekly assignments")
+                    reset_ran = True
             
-            conn.execute("UPDATE settings SET value = ? WHERE key = 'last_reset_week'", (this_monday_str,))
-            print(f"Reset {len(weekly_completed)} weekly chores and {len(weekly_assignments)} weekly assignments")
+            # A reset rewrites many rows at once; copy them back into the database file and
+            # truncate the WAL so it doesn't sit at its high-water size until the next reset
+            if reset_ran:
+                conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
         
-        conn.commit()
-        conn.close()
+        _reset_cache['date'] = checked_date
     except Exception as e:
         print(f"Error in check_and_reset_chores: {e}")
 
+def seconds_until_next_check():
+    """Seconds until just after local midnight, capped at RESET_CHECK_INTERVAL."""
+    now = datetime.now()
+    next_midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+    return min((next_midnight - now).total_seconds() + 1, RESET_CHECK_INTERVAL)
+
+def schedule_chore_reset():
+    """Run the daily/weekly reset check, then re-arm a timer for the next check."""
+    check_and_reset_chores()
+    timer = threading.Timer(seconds_until_next_check(), schedule_chore_reset)
+    timer.daemon = True
+    timer.start()
+
 @app.route('/')
 def index():
     """Serve the main page."""
-    return send_from_directory('static', 'index.html')
+    # no-cache: browsers revalidate the page on every load, so a deploy reaches them at once
+    return send_from_directory(app.static_folder, 'index.html', max_age=0)
 
 @app.route('/health')
 def health():
     """Health check endpoint for deployment platforms."""
     return jsonify({'status': 'healthy', 'message': 'Chore List App is running'}), 200
 
+@functools.lru_cache(maxsize=16)
+def build_chores_body(data_version, user_id, is_admin):
+    """Encode the chore list for one viewer; cached per data version so polls between writes skip the queries."""
+    with get_conn() as conn:
+        # Read chores and assignments from one snapshot; get_conn ends it on the way out
+        conn.execute('BEGIN')
+        
+        # Every assignment in one query, grouped by chore, instead of one query per chore
+        cursor = conn.execute(SQL_GET_ALL_ASSIGNMENTS)
+        assignment_keys = column_names(cursor)
+        assignments_by_chore = {}
+        for row in cursor:
+            assignment = dict(zip(assignment_keys, row))
+            assignments_by_chore.setdefault(assignment['chore_id'], []).append(assignment)
+        
+        if is_admin:
+            # Admins see all chores, sorted by priority (high first)
+            cursor = conn.execute(SQL_GET_CHORES_ALL)
+        elif user_id:
+            # Regular users see:
+            # 1. General chores (assigned_to_all = 1) that are incomplete OR completed by them
+            # 2. Assigned chores where they are assigned
+            cursor = conn.execute(SQL_GET_CHORES_FOR_USER, (user_id, user_id))
+        else:
+            cursor = conn.execute(SQL_GET_CHORES_ALL)
+        keys = column_names(cursor)
+        
+        chores_list = []
+        for row in cursor:
+            chore_dict = dict(zip(keys, row))
+            chore_dict['assignments'] = assignments_by_chore.get(chore_dict['id'], [])
+            chores_list.append(chore_dict)
+    
+    # One encoder call for the whole list; the body is cached per data version, so there is
+    # nothing to gain from encoding or streaming it piece by piece
+    return orjson.dumps(chores_list)
+
 @app.route('/api/chores', methods=['GET'])
 def get_chores():
     """Get chores with assignments."""
-    # Check and reset chores (daily and weekly)
-    check_and_reset_chores()
-    
     user_id = request.args.get('user_id', type=int)
     is_admin = request.args.get('is_admin', 'false').lower() == 'true'
     
-    conn = get_db_connection()
-    
-    if is_admin:
-        # Admins see all chores, sorted by priority (high first)
-        chores = conn.execute('''
-            SELECT * FROM chores 
-            ORDER BY 
-                CASE priority 
-                    WHEN 'high' THEN 1 
-                    WHEN 'medium' THEN 2 
-                    WHEN 'low' THEN 3 
-                END,
-                created_at DESC
-        ''').fetchall()
-    elif user_id:
-        # Regular users see:
-        # 1. General chores (assigned_to_all = 1) that are incomplete OR completed by them
-        # 2. Assigned chores where they are assigned
-        chores = conn.execute('''
-            SELECT DISTINCT c.* FROM chores c
-            LEFT JOIN chore_assignments ca ON c.id = ca.chore_id
-            WHERE 
-                (c.assigned_to_all = 1 AND (c.completed = 0 OR c.completed_by = ?))
-                OR (c.assigned_to_all = 0 AND ca.user_id = ?)
-            ORDER BY 
-                CASE c.priority 
-                    WHEN 'high' THEN 1 
-                    WHEN 'medium' THEN 2 
-                    WHEN 'low' THEN 3 
-                END,
-                c.created_at DESC
-        ''', (user_id, user_id)).fetchall()
-    else:
-        chores = conn.execute('''
-            SELECT * FROM chores 
-            ORDER BY 
-                CASE priority 
-                    WHEN 'high' THEN 1 
-                    WHEN 'medium' THEN 2 
-                    WHEN 'low' THEN 3 
-                END,
-                created_at DESC
-        ''').fetchall()
-    
-    # Add assignment info to each chore
-    chores_list = []
-    for chore in chores:
-        chore_dict = dict(chore)
-        
-        # Get assignments for this chore
-        assignments = conn.execute('''
-            SELECT ca.*, u.name as user_name 
-            FROM chore_assignments ca
-            JOIN users u ON ca.user_id = u.id
-            WHERE ca.chore_id = ?
-        ''', (chore['id'],)).fetchall()
-        
-        chore_dict['assignments'] = [dict(a) for a in assignments]
-        chores_list.append(chore_dict)
-    
-    conn.close()
-    
-    return jsonify(chores_list)
+    data_version = current_data_version()
+    
+    etag = f'{data_version}-{user_id or 0}-{int(is_admin)}'
+    return etag_response(etag, lambda: build_chores_body(data_version, user_id, is_admin))
 
 @app.route('/api/chores/<int:chore_id>', methods=['GET'])
 def get_chore(chore_id):
     """Get a specific chore by ID."""
-    conn = get_db_connection()
-    chore = conn.execute('SELECT * FROM chores WHERE id = ?', (chore_id,)).fetchone()
-    conn.close()
+    with get_conn() as conn:
+        chore = conn.execute(SQL_GET_CHORE_BY_ID, (chore_id,)).fetchone()
     
     if chore is None:
         return jsonify({'error': 'Chore not found'}), 404
@@ -409,7 +909,7 @@ def get_chore(chore_id):
 @app.route('/api/chores', methods=['POST'])
 def create_chore():
     """Create a new chore with optional user assignments."""
-    data = request.get_json()
+    data = parse_body()
     
     if not data or 'title' not in data:
         return jsonify({'error': 'Title is required'}), 400
@@ -424,157 +924,124 @@ def create_chore():
     # Set points based on priority: high = 2 points, others = 1 point
     points = 2 if priority == 'high' else 1
     
-    conn = get_db_connection()
-    cursor = conn.execute(
-        'INSERT INTO chores (title, description, priority, points, recurrence_type, assigned_to_all) VALUES (?, ?, ?, ?, ?, ?)',
-        (title, description, priority, points, recurrence_type, 1 if assigned_to_all else 0)
-    )
-    conn.commit()
-    chore_id = cursor.lastrowid
-    
-    # If assigned to specific users, create assignments
-    if not assigned_to_all and assigned_users:
-        for user_id in assigned_users:
-            conn.execute(
-                'INSERT INTO chore_assignments (chore_id, user_id) VALUES (?, ?)',
-                (chore_id, user_id)
-            )
-        conn.commit()
-    
-    # Fetch the newly created chore with assignments
-    chore = conn.execute('SELECT * FROM chores WHERE id = ?', (chore_id,)).fetchone()
-    assignments = conn.execute('''
-        SELECT ca.*, u.name as user_name 
-        FROM chore_assignments ca
-        JOIN users u ON ca.user_id = u.id
-        WHERE ca.chore_id = ?
-    ''', (chore_id,)).fetchall()
+    params = (title, description, priority, points, recurrence_type, bool(assigned_to_all))
     
-    conn.close()
+    with get_writer() as conn, transaction(conn), known_users():
+        if HAS_RETURNING:
+            chore = conn.execute(SQL_INSERT_CHORE_RETURNING, params).fetchone()
+            chore_id = chore['id']
+        else:
+            chore_id = conn.execute(SQL_INSERT_CHORE, params).lastrowid
+        
+        # If assigned to specific users, create assignments and read them back with user names;
+        # otherwise the new chore has none and there is nothing to fetch
+        assignments = []
+        if not assigned_to_all and assigned_users:
+            conn.executemany(SQL_INSERT_ASSIGNMENT, [(chore_id, user_id) for user_id in assigned_users])
+            assignments = fetch_dicts(conn, SQL_GET_CHORE_ASSIGNMENTS, (chore_id,))
+        
+        # Fetch the newly created chore
+        if not HAS_RETURNING:
+            chore = conn.execute(SQL_GET_CHORE_BY_ID, (chore_id,)).fetchone()
     
     chore_dict = dict(chore)
-    chore_dict['assignments'] = [dict(a) for a in assignments]
+    chore_dict['assignments'] = assignments
     
     return jsonify(chore_dict), 201
 
 @app.route('/api/chores/<int:chore_id>', methods=['PUT'])
 def update_chore(chore_id):
     """Update an existing chore."""
-    data = request.get_json()
+    data = parse_body()
     
     if not data:
         return jsonify({'error': 'No data provided'}), 400
     
-    conn = get_db_connection()
-    chore = conn.execute('SELECT * FROM chores WHERE id = ?', (chore_id,)).fetchone()
-    
-    if chore is None:
-        conn.close()
-        return jsonify({'error': 'Chore not found'}), 404
-    
-    title = data.get('title', chore['title'])
-    description = data.get('description', chore['description'])
-    completed = data.get('completed', chore['completed'])
-    priority = data.get('priority', chore['priority'])
-    completed_by = data.get('completed_by', chore['completed_by'])
-    recurrence_type = data.get('recurrence_type', chore['recurrence_type'])
-    assigned_to_all = data.get('assigned_to_all', chore['assigned_to_all'])
+    # Only the fields the request sent are changed; see SQL_UPDATE_CHORE
+    params = {'id': chore_id}
+    for field in CHORE_UPDATE_FIELDS:
+        params['has_' + field] = field in data
+        params[field] = data.get(field)
+    params['assigned_to_all'] = bool(params['assigned_to_all'])
     assigned_users = data.get('assigned_users', [])
     
-    # Set points based on priority
-    points = 2 if priority == 'high' else 1
-    
-    # If marking as incomplete, clear the completed_by field
-    if not completed:
-        completed_by = None
-    
-    conn.execute(
-        '''UPDATE chores 
-           SET title = ?, description = ?, completed = ?, priority = ?, points = ?, completed_by = ?, recurrence_type = ?, assigned_to_all = ?, updated_at = CURRENT_TIMESTAMP
-           WHERE id = ?''',
-        (title, description, completed, priority, points, completed_by, recurrence_type, 1 if assigned_to_all else 0, chore_id)
-    )
-    
-    # Update assignments if this is an assigned chore
-    if not assigned_to_all and assigned_users:
-        # Delete existing assignments
-        conn.execute('DELETE FROM chore_assignments WHERE chore_id = ?', (chore_id,))
+    with get_writer() as conn, transaction(conn), known_users():
+        # rowcount / RETURNING tell us whether the chore exists, no SELECT needed first
+        if HAS_RETURNING:
+            updated_chore = conn.execute(SQL_UPDATE_CHORE_RETURNING, params).fetchone()
+        elif conn.execute(SQL_UPDATE_CHORE, params).rowcount:
+            updated_chore = conn.execute(SQL_GET_CHORE_BY_ID, (chore_id,)).fetchone()
+        else:
+            updated_chore = None
         
-        # Create new assignments
-        for user_id in assigned_users:
-            conn.execute(
-                'INSERT INTO chore_assignments (chore_id, user_id) VALUES (?, ?)',
-                (chore_id, user_id)
-            )
-    elif assigned_to_all:
-        # If switching to "everyone can complete", remove all assignments
-        conn.execute('DELETE FROM chore_assignments WHERE chore_id = ?', (chore_id,))
-    
-    conn.commit()
-    
-    # Fetch the updated chore with assignments
-    updated_chore = conn.execute('SELECT * FROM chores WHERE id = ?', (chore_id,)).fetchone()
-    assignments = conn.execute('''
-        SELECT ca.*, u.name as user_name 
-        FROM chore_assignments ca
-        JOIN users u ON ca.user_id = u.id
-        WHERE ca.chore_id = ?
-    ''', (chore_id,)).fetchall()
-    
-    conn.close()
+        if updated_chore is None:
+            return jsonify({'error': 'Chore not found'}), 404
+        assigned_to_all = updated_chore['assigned_to_all']
+        
+        # Update assignments if this is an assigned chore
+        if not assigned_to_all and assigned_users:
+            # Delete existing assignments
+            conn.execute(SQL_DELETE_CHORE_ASSIGNMENTS, (chore_id,))
+            
+            # Create new assignments
+            conn.executemany(SQL_INSERT_ASSIGNMENT, [(chore_id, user_id) for user_id in assigned_users])
+        elif assigned_to_all:
+            # If switching to "everyone can complete", remove all assignments
+            conn.execute(SQL_DELETE_CHORE_ASSIGNMENTS, (chore_id,))
+        
+        # Fetch the chore's assignments for the response; a general chore has none left
+        assignments = [] if assigned_to_all else fetch_dicts(conn, SQL_GET_CHORE_ASSIGNMENTS, (chore_id,))
     
     chore_dict = dict(updated_chore)
-    chore_dict['assignments'] = [dict(a) for a in assignments]
+    chore_dict['assignments'] = assignments
     
     return jsonify(chore_dict)
 
 @app.route('/api/chores/<int:chore_id>', methods=['DELETE'])
 def delete_chore(chore_id):
     """Delete a chore."""
-    conn = get_db_connection()
-    chore = conn.execute('SELECT * FROM chores WHERE id = ?', (chore_id,)).fetchone()
+    with get_writer() as conn:
+        # Assignments and history go with it via ON DELETE CASCADE
+        deleted = conn.execute(SQL_DELETE_CHORE, (chore_id,)).rowcount
     
-    if chore is None:
-        conn.close()
+    if deleted == 0:
         return jsonify({'error': 'Chore not found'}), 404
     
-    conn.execute('DELETE FROM chores WHERE id = ?', (chore_id,))
-    conn.commit()
-    conn.close()
-    
     return jsonify({'message': 'Chore deleted successfully'}), 200
 
 # ============ USER ENDPOINTS ============
 
+@functools.lru_cache(maxsize=2)
+def build_users_body(data_version):
+    """Encode the user list; cached per data version since users rarely change."""
+    with get_conn() as conn:
+        cursor = conn.execute(SQL_GET_USERS)
+        return rows_to_json(cursor, column_names(cursor))
+
 @app.route('/api/users', methods=['GET'])
 def get_users():
     """Get all users."""
-    conn = get_db_connection()
-    users = conn.execute('SELECT * FROM users ORDER BY name ASC').fetchall()
-    conn.close()
+    data_version = current_data_version()
     
-    return jsonify([dict(user) for user in users])
+    return etag_response(f'users-{data_version}', lambda: build_users_body(data_version))
 
 @app.route('/api/users/<int:user_id>', methods=['PUT'])
 def update_user(user_id):
     """Update user preferences (avatar, color)."""
-    data = request.get_json()
+    data = parse_body()
     avatar = data.get('avatar')
     color = data.get('color')
     
-    conn = get_db_connection()
-    
-    # Update only provided fields
-    if avatar is not None:
-        conn.execute('UPDATE users SET avatar = ? WHERE id = ?', (avatar, user_id))
-    if color is not None:
-        conn.execute('UPDATE users SET color = ? WHERE id = ?', (color, user_id))
-    
-    conn.commit()
-    
-    # Fetch updated user
-    user = conn.execute('SELECT * FROM users WHERE id = ?', (user_id,)).fetchone()
-    conn.close()
+    with get_writer() as conn:
+        # Update only provided fields
+        with transaction(conn):
+            if avatar is not None:
+                conn.execute(SQL_UPDATE_USER_AVATAR, (avatar, user_id))
+            if color is not None:
+                conn.execute(SQL_UPDATE_USER_COLOR, (color, user_id))
+        
+        # Fetch updated user
+        user = conn.execute(SQL_GET_USER_BY_ID, (user_id,)).fetchone()
     
     return jsonify(dict(user))
 
@@ -582,270 +1049,158 @@ def update_user(user_id):
 def complete_assignment(assignment_id):
     """Mark a chore assignment as complete."""
     try:
-        data = request.get_json()
+        data = parse_body()
         completed = data.get('completed', True)
         
-        conn = get_db_connection()
+        with get_writer() as conn:
+            # Update the assignment; no row updated means it doesn't exist
+            updated = conn.execute(SQL_COMPLETE_ASSIGNMENT, {'completed': bool(completed), 'id': assignment_id}).rowcount
         
-        # First check if assignment exists
-        assignment = conn.execute('SELECT * FROM chore_assignments WHERE id = ?', (assignment_id,)).fetchone()
-        if not assignment:
-            conn.close()
+        if updated == 0:
             return jsonify({'error': 'Assignment not found'}), 404
         
-        # Update the assignment
-        conn.execute('''
-            UPDATE chore_assignments 
-            SET completed = ?, completed_at = ?
-            WHERE id = ?
-        ''', (1 if completed else 0, datetime.now().isoformat() if completed else None, assignment_id))
-        conn.commit()
-        conn.close()
-        
         return jsonify({'success': True})
     except Exception as e:
         print(f"Error completing assignment {assignment_id}: {e}")
         return jsonify({'error': str(e)}), 500
 
+@functools.lru_cache(maxsize=4)
+def build_leaderboard_body(data_version, all_time):
+    """Encode a leaderboard; cached per data version so the point sums only rerun after a write."""
+    with get_conn() as conn:
+        sql = SQL_GET_ALL_TIME_LEADERBOARD if all_time else SQL_GET_LEADERBOARD
+        return rows_to_json(conn.execute(sql), LEADERBOARD_KEYS)
+
 @app.route('/api/leaderboard', methods=['GET'])
 def get_leaderboard():
     """Get leaderboard with points (sum of chore point values) for each user this week."""
-    conn = get_db_connection()
+    data_version = current_data_version()
     
     # Sum points from completed general chores + completed assignments
-    leaderboard = conn.execute('''
-        SELECT 
-            u.id,
-            u.name,
-            u.role,
-            u.avatar,
-            u.color,
-            COALESCE((
-                SELECT SUM(c.points) FROM chores c 
-                WHERE c.completed_by = u.id AND c.completed = 1
-            ), 0) + COALESCE((
-                SELECT SUM(c.points) FROM chore_assignments ca
-                JOIN chores c ON ca.chore_id = c.id
-                WHERE ca.user_id = u.id AND ca.completed = 1
-            ), 0) as points
-        FROM users u
-        ORDER BY points DESC, u.name ASC
-    ''').fetchall()
-    
-    conn.close()
-    
-    return jsonify([dict(entry) for entry in leaderboard])
+    return etag_response(f'week-{data_version}', lambda: build_leaderboard_body(data_version, False))
 
 @app.route('/api/leaderboard/all-time', methods=['GET'])
 def get_all_time_leaderboard():
     """Get all-time leaderboard with cumulative points (historical + current week)."""
-    conn = get_db_connection()
+    data_version = current_data_version()
     
     # Sum all-time points PLUS current week's points
-    leaderboard = conn.execute('''
-        SELECT 
-            u.id,
-            u.name,
-            u.role,
-            u.avatar,
-            u.color,
-            COALESCE((SELECT SUM(points) FROM all_time_points WHERE user_id = u.id), 0) + 
-            COALESCE((
-                SELECT SUM(c.points) FROM chores c 
-                WHERE c.completed_by = u.id AND c.completed = 1
-            ), 0) + 
-            COALESCE((
-                SELECT SUM(c.points) FROM chore_assignments ca
-                JOIN chores c ON ca.chore_id = c.id
-                WHERE ca.user_id = u.id AND ca.completed = 1
-            ), 0) as points
-        FROM users u
-        ORDER BY points DESC, u.name ASC
-    ''').fetchall()
-    
-    conn.close()
-    
-    return jsonify([dict(entry) for entry in leaderboard])
+    return etag_response(f'all-time-{data_version}', lambda: build_leaderboard_body(data_version, True))
 
 @app.route('/api/users/<int:user_id>/history', methods=['GET'])
 def get_user_history(user_id):
     """Get completion history for a user (for leaderboard details)."""
-    conn = get_db_connection()
-    
-    # Get completed chores this week
-    completed_chores = conn.execute('''
-        SELECT c.title, c.completed_by, 'chore' as type
-        FROM chores c
-        WHERE c.completed_by = ? AND c.completed = 1
-    ''', (user_id,)).fetchall()
-    
-    # Get completed assignments this week
-    completed_assignments = conn.execute('''
-        SELECT c.title, ca.user_id, 'assignment' as type
-        FROM chore_assignments ca
-        JOIN chores c ON ca.chore_id = c.id
-        WHERE ca.user_id = ? AND ca.completed = 1
-    ''', (user_id,)).fetchall()
+    with get_conn() as conn:
+        # Completed chores and assignments this week, in one query
+        rows = conn.execute(SQL_GET_USER_HISTORY, (user_id,))
+        body = orjson.dumps([dict(zip(HISTORY_KEYS[row[2]], row)) for row in rows])
     
-    conn.close()
-    
-    all_completions = [dict(row) for row in completed_chores] + [dict(row) for row in completed_assignments]
-    
-    return jsonify(all_completions)
+    return json_response(body)
 
 @app.route('/api/users/<int:user_id>/points/adjust', methods=['POST'])
 def adjust_user_points(user_id):
     """Admin endpoint to manually adjust user's points."""
-    data = request.get_json()
+    data = parse_body()
     points = data.get('points', 0)  # Can be negative
     reason = data.get('reason', 'Manual adjustment')
     
     if points == 0:
         return jsonify({'error': 'Points must be non-zero'}), 400
     
-    conn = get_db_connection()
-    
     # Create a special completed chore for weekly display (works for both + and -)
     # Positive = bonus chore, Negative = penalty chore
     title = f"⭐ {reason}" if points > 0 else f"⚠️ {reason}"
     description = f"Admin {'bonus' if points > 0 else 'penalty'}: {'+' if points > 0 else ''}{points} points"
     
-    conn.execute('''
-        INSERT INTO chores (title, description, priority, points, recurrence_type, assigned_to_all, completed, completed_by)
-        VALUES (?, ?, 'medium', ?, 'one-time', 0, 1, ?)
-    ''', (title, description, points, user_id))
-    
-    # Note: We don't add to all_time_points table here because the chore above
-    # will automatically be counted in all-time leaderboard (it sums weekly + historical)
-    
-    conn.commit()
-    conn.close()
+    with get_writer() as conn, known_users():
+        conn.execute(SQL_INSERT_POINTS_ADJUSTMENT, (title, description, points, user_id))
+        
+        # Note: We don't add to all_time_points table here because the chore above
+        # will automatically be counted in all-time leaderboard (it sums weekly + historical)
     
     return jsonify({'success': True, 'points': points})
 
 @app.route('/api/chores/<int:chore_id>/split', methods=['POST'])
 def split_general_chore(chore_id):
     """Split a general chore with another user by converting it to assignments."""
-    data = request.get_json()
+    data = parse_body()
     user_id = data.get('user_id')  # Current user
     split_with_user_id = data.get('split_with_user_id')
     
     if not user_id or not split_with_user_id:
         return jsonify({'error': 'user_id and split_with_user_id required'}), 400
     
-    conn = get_db_connection()
-    
-    # Get the chore
-    chore = conn.execute('SELECT * FROM chores WHERE id = ?', (chore_id,)).fetchone()
-    if not chore:
-        conn.close()
-        return jsonify({'error': 'Chore not found'}), 404
-    
-    # Check if it's a general chore
-    if not chore['assigned_to_all']:
-        conn.close()
-        return jsonify({'error': 'This chore is already assigned'}), 400
-    
-    # Check if already completed
-    if chore['completed']:
-        conn.close()
-        return jsonify({'error': 'Cannot split completed chore'}), 400
-    
-    # Divide the points between users
-    original_points = chore['points']
-    points_per_person = original_points / 2
-    
-    # Convert to assigned chore and update points to split value
-    conn.execute('UPDATE chores SET assigned_to_all = 0, points = ? WHERE id = ?', (points_per_person, chore_id))
-    
-    # Create assignments for both users
-    conn.execute('''
-        INSERT INTO chore_assignments (chore_id, user_id, completed)
-        VALUES (?, ?, 0)
-    ''', (chore_id, user_id))
-    
-    conn.execute('''
-        INSERT INTO chore_assignments (chore_id, user_id, completed)
-        VALUES (?, ?, 0)
-    ''', (chore_id, split_with_user_id))
-    
-    conn.commit()
-    conn.close()
+    with get_writer() as conn, transaction(conn), known_users():
+        # Get the chore
+        chore = conn.execute(SQL_GET_CHORE_BY_ID, (chore_id,)).fetchone()
+        if not chore:
+            return jsonify({'error': 'Chore not found'}), 404
+        
+        # Check if it's a general chore
+        if not chore['assigned_to_all']:
+            return jsonify({'error': 'This chore is already assigned'}), 400
+        
+        # Check if already completed
+        if chore['completed']:
+            return jsonify({'error': 'Cannot split completed chore'}), 400
+        
+        # Divide the points between users
+        points_per_person = chore['points'] / 2
+        
+        # Convert to assigned chore and update points to split value
+        conn.execute(SQL_SPLIT_GENERAL_CHORE, (points_per_person, chore_id))
+        
+        # Create assignments for both users
+        conn.executemany(SQL_INSERT_SPLIT_ASSIGNMENT, [(chore_id, user_id), (chore_id, split_with_user_id)])
     
     return jsonify({
         'success': True,
-        'message': f'✅ Task split! The {original_points} points are now divided: you each get {int(points_per_person)} point(s) when completed. (Total: {original_points} points awarded)'
+        'message': split_message(points_per_person)
     })
 
 @app.route('/api/chores/assignment/<int:assignment_id>/split', methods=['POST'])
 def split_assignment(assignment_id):
     """Split an assignment with another user."""
-    data = request.get_json()
+    data = parse_body()
     split_with_user_id = data.get('split_with_user_id')
     
     if not split_with_user_id:
         return jsonify({'error': 'split_with_user_id required'}), 400
     
-    conn = get_db_connection()
-    
-    # Get the original assignment
-    assignment = conn.execute('SELECT * FROM chore_assignments WHERE id = ?', (assignment_id,)).fetchone()
-    if not assignment:
-        conn.close()
-        return jsonify({'error': 'Assignment not found'}), 404
-    
-    # Get the chore
-    chore = conn.execute('SELECT * FROM chores WHERE id = ?', (assignment['chore_id'],)).fetchone()
-    if not chore:
-        conn.close()
-        return jsonify({'error': 'Chore not found'}), 404
-    
-    # Check if already completed
-    if assignment['completed']:
-        conn.close()
-        return jsonify({'error': 'Cannot split completed assignment'}), 400
-    
-    # Check if the other user already has an assignment
-    existing = conn.execute('''
-        SELECT id FROM chore_assignments 
-        WHERE chore_id = ? AND user_id = ?
-    ''', (assignment['chore_id'], split_with_user_id)).fetchone()
-    
-    if existing:
-        conn.close()
-        return jsonify({'error': 'Other user already has this assignment'}), 400
-    
-    # Divide the points
-    original_points = chore['points']
-    points_per_person = original_points / 2
-    
-    # Update chore points to split value
-    conn.execute('UPDATE chores SET points = ? WHERE id = ?', (points_per_person, chore['id']))
-    
-    # Create new assignment for the split user
-    conn.execute('''
-        INSERT INTO chore_assignments (chore_id, user_id, completed)
-        VALUES (?, ?, 0)
-    ''', (assignment['chore_id'], split_with_user_id))
-    
-    conn.commit()
-    conn.close()
+    with get_writer() as conn, transaction(conn), known_users():
+        # Create the new assignment for the split user in one statement; nothing is inserted if the
+        # assignment is missing or completed, or the other user already has this chore
+        inserted = conn.execute(SQL_INSERT_SPLIT_FROM_ASSIGNMENT, (split_with_user_id, assignment_id)).rowcount
+        if inserted == 0:
+            # Work out which of those it was; only failed splits pay for this lookup
+            assignment = conn.execute(SQL_GET_ASSIGNMENT_COMPLETED, (assignment_id,)).fetchone()
+            if not assignment:
+                return jsonify({'error': 'Assignment not found'}), 404
+            if assignment['completed']:
+                return jsonify({'error': 'Cannot split completed assignment'}), 400
+            return jsonify({'error': 'Other user already has this assignment'}), 400
+        
+        # Divide the chore's points between the two users
+        if HAS_RETURNING:
+            points_per_person = conn.execute(SQL_HALVE_ASSIGNMENT_CHORE_POINTS_RETURNING, (assignment_id,)).fetchone()[0]
+        else:
+            conn.execute(SQL_HALVE_ASSIGNMENT_CHORE_POINTS, (assignment_id,))
+            points_per_person = conn.execute(SQL_GET_ASSIGNMENT_CHORE_POINTS, (assignment_id,)).fetchone()[0]
     
     return jsonify({
         'success': True,
-        'message': f'✅ Task split! The {original_points} points are now divided: you each get {int(points_per_person)} point(s) when completed. (Total: {original_points} points awarded)'
+        'message': split_message(points_per_person)
     })
 
 # Initialize database when app loads (important for production/gunicorn)
-print("=" * 50)
-print("🏠 CHORE LIST APP STARTING UP...")
-print("=" * 50)
 initialize_database()
-print("✅ Database initialized successfully")
-print(f"📊 App ready to serve requests")
-print("=" * 50)
+schedule_chore_reset()
 
 if __name__ == '__main__':
+    # Cloud platforms serve through gunicorn (Procfile / render.yaml); never fall back to the dev server there
+    if os.environ.get('RENDER') or os.environ.get('DYNO'):
+        raise SystemExit('Refusing to start the Flask dev server in production; run: gunicorn -c gunicorn.conf.py app:app')
+    
     # Database already initialized above, no need to call init_db() again
     # Check if running in Electron or standalone
     is_electron = os.environ.get('FLASK_ENV') == 'production'
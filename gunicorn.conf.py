@@ -0,0 +1,21 @@
+# Gunicorn settings for cloud deployment (Render, Heroku, etc.)
+# Electron and local runs still use `python app.py`.
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+
+# Threaded workers: requests mostly wait on SQLite, so threads overlap well.
+# Each worker keeps its own connection pool (POOL_SIZE in app.py), sized above `threads`.
+# A small fixed worker count: cpu_count() reports the host's CPUs inside a container, and
+# every worker adds its own pool, caches and reset timer against the one SQLite file.
+worker_class = 'gthread'
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+timeout = 30
+
+
+def post_worker_init(worker):
+    """Open the worker's first pooled connection (PRAGMAs applied) before it takes requests."""
+    from app import get_conn
+    with get_conn():
+        pass